@@ -3,16 +3,97 @@ BookStore API - A sample REST API demonstrating typical REST principles
 Similar to PetStore API with full CRUD operations and OpenAPI specification
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from flasgger import Swagger, swag_from
-from datetime import datetime
-import uuid
+from sortedcontainers import SortedList
+from collections import defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
+import hashlib
+import math
+import msgspec
+import orjson
+import threading
+import time
 import os
+import sys
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (also used by Flasgger's spec views)"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Bound the cost of parsing request bodies; larger requests get a 413
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024
 CORS(app)
 
+
+def json_bytes_response(body, status=200, etag=None):
+    """Wrap an already-encoded JSON body in a response (Content-Length is set from the bytes)"""
+    response = app.response_class(body, status=status, content_type='application/json')
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+json_encoder = msgspec.json.Encoder()
+
+
+def json_response(obj, status=200, etag=None):
+    """Serialize obj (which may contain record structs) and wrap it in a JSON response"""
+    return json_bytes_response(json_encoder.encode(obj), status, etag)
+
+
+# Unique per process start, so version-based ETags from before a restart
+# (when the counters begin again at 0) never match the new store
+etag_prefix = os.urandom(4).hex()
+
+
+def not_modified(etag):
+    """304 response if the client's If-None-Match already covers etag, else None"""
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+
+@app.errorhandler(413)
+def payload_too_large(error):
+    """Report oversized request bodies as JSON"""
+    return json_response({"error": "Payload too large"}, 413)
+
+
+# (epoch second, formatted timestamp) of the last now_iso() call
+timestamp_cache = (0, "")
+
+
+def now_iso():
+    """Current UTC time as an ISO 8601 string, formatted at most once per second"""
+    global timestamp_cache
+    now = int(time.time())
+    cached = timestamp_cache
+    if cached[0] != now:
+        formatted = datetime.fromtimestamp(now, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        cached = timestamp_cache = (now, formatted)
+    return cached[1]
+
+
 # Swagger configuration
 swagger_config = {
     "headers": [],
@@ -58,74 +139,237 @@ swagger_template = {
     ]
 }
 
-swagger = Swagger(app, config=swagger_config, template=swagger_template)
+# Encoded spec and its ETag, built on the first /apispec.json request
+apispec_cache = None
+
+
+def cached_apispec():
+    """Serve the generated OpenAPI spec from pre-encoded bytes"""
+    global apispec_cache
+    if apispec_cache is None:
+        body = orjson.dumps(swagger.get_apispecs('apispec'), option=orjson.OPT_NON_STR_KEYS)
+        apispec_cache = (body, hashlib.sha1(body).hexdigest())
+    body, etag = apispec_cache
+    response = json_bytes_response(body)
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+# Swagger UI and spec are on unless ENABLE_SWAGGER=0 (the default under
+# gunicorn), in which case Flasgger is not even imported
+swagger_enabled = os.environ.get('ENABLE_SWAGGER', '1') == '1'
+
+if swagger_enabled:
+    from flasgger import Swagger
+
+    swagger = Swagger(app, config=swagger_config, template=swagger_template)
+    # Replace Flasgger's view, which re-serializes the spec on every request
+    app.view_functions['flasgger.apispec'] = cached_apispec
+
+
+# Request body schemas (parsed and validated in a single msgspec pass)
+class BookInput(msgspec.Struct):
+    """Body of a book create or full update request"""
+    title: str
+    author_id: str
+    isbn: str
+    published_year: int
+    price: float
+    stock: int = 0
+
+
+# Book fields a client may set (PATCH applies any subset of them)
+BOOK_FIELDS = frozenset(BookInput.__struct_fields__)
+
+
+class AuthorInput(msgspec.Struct):
+    """Body of an author create or full update request"""
+    name: str
+    birth_year: int
+    nationality: str
+
+
+# Stored records. Low-cardinality string fields (author_id, nationality) are
+# interned on write so repeated values share one object and compare by identity.
+class Book(msgspec.Struct):
+    """A book in the store"""
+    id: str
+    title: str
+    author_id: str
+    isbn: str
+    published_year: int
+    price: float
+    stock: int
+    created_at: str
+    updated_at: str
+
+
+class Author(msgspec.Struct):
+    """An author in the store"""
+    id: str
+    name: str
+    birth_year: int
+    nationality: str
+    created_at: str
+    updated_at: str
+
 
 # In-memory data store
 books = {
-    "1": {
-        "id": "1",
-        "title": "The Great Gatsby",
-        "author_id": "1",
-        "isbn": "978-0-7432-7356-5",
-        "published_year": 1925,
-        "price": 12.99,
-        "stock": 42,
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    },
-    "2": {
-        "id": "2",
-        "title": "To Kill a Mockingbird",
-        "author_id": "2",
-        "isbn": "978-0-06-112008-4",
-        "published_year": 1960,
-        "price": 14.99,
-        "stock": 28,
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    },
-    "3": {
-        "id": "3",
-        "title": "1984",
-        "author_id": "3",
-        "isbn": "978-0-452-28423-4",
-        "published_year": 1949,
-        "price": 13.99,
-        "stock": 35,
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    }
+    "1": Book(
+        id="1",
+        title="The Great Gatsby",
+        author_id="1",
+        isbn="978-0-7432-7356-5",
+        published_year=1925,
+        price=12.99,
+        stock=42,
+        created_at="2024-01-01T00:00:00Z",
+        updated_at="2024-01-01T00:00:00Z"
+    ),
+    "2": Book(
+        id="2",
+        title="To Kill a Mockingbird",
+        author_id="2",
+        isbn="978-0-06-112008-4",
+        published_year=1960,
+        price=14.99,
+        stock=28,
+        created_at="2024-01-01T00:00:00Z",
+        updated_at="2024-01-01T00:00:00Z"
+    ),
+    "3": Book(
+        id="3",
+        title="1984",
+        author_id="3",
+        isbn="978-0-452-28423-4",
+        published_year=1949,
+        price=13.99,
+        stock=35,
+        created_at="2024-01-01T00:00:00Z",
+        updated_at="2024-01-01T00:00:00Z"
+    )
 }
 
 authors = {
-    "1": {
-        "id": "1",
-        "name": "F. Scott Fitzgerald",
-        "birth_year": 1896,
-        "nationality": "American",
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    },
-    "2": {
-        "id": "2",
-        "name": "Harper Lee",
-        "birth_year": 1926,
-        "nationality": "American",
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    },
-    "3": {
-        "id": "3",
-        "name": "George Orwell",
-        "birth_year": 1903,
-        "nationality": "British",
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    }
+    "1": Author(
+        id="1",
+        name="F. Scott Fitzgerald",
+        birth_year=1896,
+        nationality="American",
+        created_at="2024-01-01T00:00:00Z",
+        updated_at="2024-01-01T00:00:00Z"
+    ),
+    "2": Author(
+        id="2",
+        name="Harper Lee",
+        birth_year=1926,
+        nationality="American",
+        created_at="2024-01-01T00:00:00Z",
+        updated_at="2024-01-01T00:00:00Z"
+    ),
+    "3": Author(
+        id="3",
+        name="George Orwell",
+        birth_year=1903,
+        nationality="British",
+        created_at="2024-01-01T00:00:00Z",
+        updated_at="2024-01-01T00:00:00Z"
+    )
 }
 
+# Secondary indexes
+# author_id -> ids of that author's books. Inner dicts are used as
+# insertion-ordered sets so listings keep a stable order.
+books_by_author = defaultdict(dict)
+# (price, book_id) pairs sorted by price, then id; ids are unique, so each
+# entry is found by bisection and equal prices keep a deterministic order
+books_by_price = SortedList()
+
+
+def index_book(book):
+    """Add a book to the secondary indexes"""
+    books_by_author[book.author_id][book.id] = None
+    books_by_price.add((book.price, book.id))
+
+
+def unindex_book(book):
+    """Remove a book from the secondary indexes"""
+    book_ids = books_by_author.get(book.author_id)
+    if book_ids is not None:
+        book_ids.pop(book.id, None)
+        if not book_ids:
+            del books_by_author[book.author_id]
+    books_by_price.discard((book.price, book.id))
+
+
+def reindex_book(old_book, new_book):
+    """Update the indexes for a replaced book, touching only those whose key changed
+
+    Leaving unchanged entries alone keeps the book's position in its author
+    bucket, so an unrelated update does not reorder author listings.
+    """
+    if old_book.author_id != new_book.author_id:
+        book_ids = books_by_author[old_book.author_id]
+        del book_ids[old_book.id]
+        if not book_ids:
+            del books_by_author[old_book.author_id]
+        books_by_author[new_book.author_id][new_book.id] = None
+    if old_book.price != new_book.price:
+        books_by_price.remove((old_book.price, old_book.id))
+        books_by_price.add((new_book.price, new_book.id))
+
+
+for _book in books.values():
+    index_book(_book)
+
+# Serializes writes to the store, its indexes and the write counters. Plain
+# reads are not locked: single dict operations are atomic under the GIL and
+# records are replaced rather than mutated in place. Only reads that walk
+# an index take the lock, since a concurrent write could change it mid-walk.
+store_lock = threading.RLock()
+
+# Write counters, bumped after every completed mutation so cached list
+# responses keyed on them are never reused once the store has changed
+books_version = 0
+authors_version = 0
+
+
+@lru_cache(maxsize=16)
+def list_books_body(version, offset, limit):
+    """Encoded page of the unfiltered book listing for the given books_version"""
+    with store_lock:
+        page = list(islice(books.values(), offset, offset + limit))
+    return json_encoder.encode({
+        "books": page,
+        "count": len(page),
+        "offset": offset,
+        "limit": limit
+    })
+
+
+@lru_cache(maxsize=4)
+def list_authors_body(version):
+    """Encoded author listing for the given authors_version"""
+    with store_lock:
+        listing = list(authors.values())
+    return json_encoder.encode({
+        "authors": listing,
+        "count": len(listing)
+    })
+
 
 # Health Check Endpoint
+
+@lru_cache(maxsize=2)
+def health_body(timestamp):
+    """Encoded health payload for a now_iso() timestamp, reused within the same second"""
+    return orjson.dumps({
+        "status": "healthy",
+        "timestamp": timestamp
+    })
+
+
 @app.route('/api/v1/health', methods=['GET'])
 def health_check():
     """
@@ -147,10 +391,7 @@ def health_check():
               type: string
               example: "2024-01-01T00:00:00Z"
     """
-    return jsonify({
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }), 200
+    return json_bytes_response(health_body(now_iso()), 200)
 
 
 # Books Endpoints
@@ -179,9 +420,30 @@ def get_books():
         type: number
         required: false
         description: Filter books with price less than or equal to this value
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 100
+        description: Maximum number of books to return (at most 1000)
+      - name: offset
+        in: query
+        type: integer
+        required: false
+        default: 0
+        description: Number of matching books to skip
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag from a previous response; returns 304 with no body if it still matches
     responses:
       200:
-        description: List of books
+        description: A page of books
+        headers:
+          ETag:
+            type: string
+            description: Weak validator that changes when the data may have changed
         schema:
           type: object
           properties:
@@ -210,26 +472,70 @@ def get_books():
                     type: string
             count:
               type: integer
+              description: Number of books in this page
+            offset:
+              type: integer
+            limit:
+              type: integer
+      304:
+        description: Not modified (empty body)
+        headers:
+          ETag:
+            type: string
+      400:
+        description: Invalid price filter
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
     """
     author_id = request.args.get('author_id')
     min_price = request.args.get('min_price', type=float)
     max_price = request.args.get('max_price', type=float)
+    for bound in (min_price, max_price):
+        if bound is not None and not math.isfinite(bound):
+            return json_response({"error": "Price filters must be finite numbers"}, 400)
+    limit = min(max(request.args.get('limit', 100, type=int), 0), 1000)
+    offset = max(request.args.get('offset', 0, type=int), 0)
     
-    filtered_books = list(books.values())
+    # The version is read before the store, so the ETag is never newer than the data
+    version = books_version
+    etag = f'{etag_prefix}-b{version}'
+    cached = not_modified(etag)
+    if cached:
+        return cached
     
     if author_id:
-        filtered_books = [b for b in filtered_books if b['author_id'] == author_id]
+        # Single lazy pass over the author's books, stopping once the page is full
+        low = min_price if min_price is not None else -math.inf
+        high = max_price if max_price is not None else math.inf
+        with store_lock:
+            matches = (
+                book for book in map(books.__getitem__, books_by_author.get(author_id, ()))
+                if low <= book.price <= high
+            )
+            filtered_books = list(islice(matches, offset, offset + limit))
+    elif min_price is not None or max_price is not None:
+        # Price-only filters are answered from the sorted index (ordered by price),
+        # slicing the page out by position
+        with store_lock:
+            # (price,) sorts before and (price, chr(0x10FFFF)) after every
+            # (price, book_id) entry with that price
+            start = 0 if min_price is None else books_by_price.bisect_left((min_price,))
+            stop = (len(books_by_price) if max_price is None
+                    else books_by_price.bisect_right((max_price, chr(0x10FFFF))))
+            page = books_by_price.islice(start + offset, min(start + offset + limit, stop))
+            filtered_books = [books[bid] for _, bid in page]
+    else:
+        return json_bytes_response(list_books_body(version, offset, limit), 200, etag)
     
-    if min_price is not None:
-        filtered_books = [b for b in filtered_books if b['price'] >= min_price]
-    
-    if max_price is not None:
-        filtered_books = [b for b in filtered_books if b['price'] <= max_price]
-    
-    return jsonify({
+    return json_response({
         "books": filtered_books,
-        "count": len(filtered_books)
-    }), 200
+        "count": len(filtered_books),
+        "offset": offset,
+        "limit": limit
+    }, 200, etag)
 
 
 @app.route('/api/v1/books/<book_id>', methods=['GET'])
@@ -246,9 +552,18 @@ def get_book(book_id):
         type: string
         required: true
         description: The ID of the book to retrieve
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag from a previous response; returns 304 with no body if it still matches
     responses:
       200:
         description: Book details
+        headers:
+          ETag:
+            type: string
+            description: Weak validator that changes when the data may have changed
         schema:
           type: object
           properties:
@@ -270,6 +585,11 @@ def get_book(book_id):
               type: string
             updated_at:
               type: string
+      304:
+        description: Not modified (empty body)
+        headers:
+          ETag:
+            type: string
       404:
         description: Book not found
         schema:
@@ -279,10 +599,11 @@ def get_book(book_id):
               type: string
               example: "Book not found"
     """
+    etag = f'{etag_prefix}-b{books_version}-{book_id}'
     book = books.get(book_id)
     if not book:
-        return jsonify({"error": "Book not found"}), 404
-    return jsonify(book), 200
+        return json_response({"error": "Book not found"}, 404)
+    return not_modified(etag) or json_response(book, 200, etag)
 
 
 @app.route('/api/v1/books', methods=['POST'])
@@ -350,39 +671,48 @@ def create_book():
             updated_at:
               type: string
       400:
-        description: Invalid input
+        description: Invalid input (malformed JSON, missing required field or wrong field type)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      413:
+        description: Request body larger than 64 KiB
         schema:
           type: object
           properties:
             error:
               type: string
     """
-    data = request.get_json()
-    
-    # Validation
-    required_fields = ['title', 'author_id', 'isbn', 'published_year', 'price']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
+    global books_version
+    # Parse and validate
+    try:
+        data = msgspec.json.decode(request.get_data(cache=False), type=BookInput)
+    except msgspec.DecodeError as e:
+        return json_response({"error": str(e)}, 400)
     
     # Generate new ID
-    book_id = str(uuid.uuid4())
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    book_id = os.urandom(16).hex()
+    timestamp = now_iso()
     
-    new_book = {
-        "id": book_id,
-        "title": data['title'],
-        "author_id": data['author_id'],
-        "isbn": data['isbn'],
-        "published_year": data['published_year'],
-        "price": data['price'],
-        "stock": data.get('stock', 0),
-        "created_at": timestamp,
-        "updated_at": timestamp
-    }
+    new_book = Book(
+        id=book_id,
+        title=data.title,
+        author_id=sys.intern(data.author_id),
+        isbn=data.isbn,
+        published_year=data.published_year,
+        price=data.price,
+        stock=data.stock,
+        created_at=timestamp,
+        updated_at=timestamp
+    )
     
-    books[book_id] = new_book
-    return jsonify(new_book), 201
+    with store_lock:
+        books[book_id] = new_book
+        index_book(new_book)
+        books_version += 1
+    return json_response(new_book, 201)
 
 
 @app.route('/api/v1/books/<book_id>', methods=['PUT'])
@@ -455,41 +785,52 @@ def update_book(book_id):
             error:
               type: string
       400:
-        description: Invalid input
+        description: Invalid input (malformed JSON, missing required field or wrong field type)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      413:
+        description: Request body larger than 64 KiB
         schema:
           type: object
           properties:
             error:
               type: string
     """
+    global books_version
     if book_id not in books:
-        return jsonify({"error": "Book not found"}), 404
-    
-    data = request.get_json()
-    
-    # Validation
-    required_fields = ['title', 'author_id', 'isbn', 'published_year', 'price']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
-    
-    # Preserve original creation timestamp
-    created_at = books[book_id]['created_at']
+        return json_response({"error": "Book not found"}, 404)
     
-    updated_book = {
-        "id": book_id,
-        "title": data['title'],
-        "author_id": data['author_id'],
-        "isbn": data['isbn'],
-        "published_year": data['published_year'],
-        "price": data['price'],
-        "stock": data.get('stock', 0),
-        "created_at": created_at,
-        "updated_at": datetime.utcnow().isoformat() + "Z"
-    }
+    # Parse and validate
+    try:
+        data = msgspec.json.decode(request.get_data(cache=False), type=BookInput)
+    except msgspec.DecodeError as e:
+        return json_response({"error": str(e)}, 400)
     
-    books[book_id] = updated_book
-    return jsonify(updated_book), 200
+    with store_lock:
+        book = books.get(book_id)
+        if book is None:
+            return json_response({"error": "Book not found"}, 404)
+        
+        updated_book = Book(
+            id=book_id,
+            title=data.title,
+            author_id=sys.intern(data.author_id),
+            isbn=data.isbn,
+            published_year=data.published_year,
+            price=data.price,
+            stock=data.stock,
+            # Preserve original creation timestamp
+            created_at=book.created_at,
+            updated_at=now_iso()
+        )
+        
+        books[book_id] = updated_book
+        reindex_book(book, updated_book)
+        books_version += 1
+    return json_response(updated_book, 200)
 
 
 @app.route('/api/v1/books/<book_id>', methods=['PATCH'])
@@ -555,30 +896,54 @@ def partial_update_book(book_id):
           properties:
             error:
               type: string
+      400:
+        description: Invalid input (malformed JSON, body is not a JSON object, or a field has the wrong type)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      413:
+        description: Request body larger than 64 KiB
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
     """
+    global books_version
     if book_id not in books:
-        return jsonify({"error": "Book not found"}), 404
+        return json_response({"error": "Book not found"}, 404)
     
-    data = request.get_json()
-    book = books[book_id]
+    try:
+        data = msgspec.json.decode(request.get_data(cache=False))
+    except msgspec.DecodeError as e:
+        return json_response({"error": str(e)}, 400)
+    if not isinstance(data, dict):
+        return json_response({"error": "Request body must be a JSON object"}, 400)
     
-    # Update only provided fields
-    if 'title' in data:
-        book['title'] = data['title']
-    if 'author_id' in data:
-        book['author_id'] = data['author_id']
-    if 'isbn' in data:
-        book['isbn'] = data['isbn']
-    if 'published_year' in data:
-        book['published_year'] = data['published_year']
-    if 'price' in data:
-        book['price'] = data['price']
-    if 'stock' in data:
-        book['stock'] = data['stock']
+    with store_lock:
+        book = books.get(book_id)
+        if book is None:
+            return json_response({"error": "Book not found"}, 404)
+        
+        # Update only provided fields, then re-validate the merged record
+        fields = msgspec.structs.asdict(book)
+        for field in BOOK_FIELDS.intersection(data):
+            fields[field] = data[field]
+        fields['updated_at'] = now_iso()
+        
+        try:
+            updated_book = msgspec.convert(fields, Book)
+        except msgspec.ValidationError as e:
+            return json_response({"error": str(e)}, 400)
+        updated_book.author_id = sys.intern(updated_book.author_id)
+        
+        books[book_id] = updated_book
+        reindex_book(book, updated_book)
+        books_version += 1
     
-    book['updated_at'] = datetime.utcnow().isoformat() + "Z"
-    
-    return jsonify(book), 200
+    return json_response(updated_book, 200)
 
 
 @app.route('/api/v1/books/<book_id>', methods=['DELETE'])
@@ -606,10 +971,14 @@ def delete_book(book_id):
             error:
               type: string
     """
-    if book_id not in books:
-        return jsonify({"error": "Book not found"}), 404
-    
-    del books[book_id]
+    global books_version
+    with store_lock:
+        book = books.pop(book_id, None)
+        if book is None:
+            return json_response({"error": "Book not found"}, 404)
+        
+        unindex_book(book)
+        books_version += 1
     return '', 204
 
 
@@ -623,9 +992,19 @@ def get_authors():
     ---
     tags:
       - authors
+    parameters:
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag from a previous response; returns 304 with no body if it still matches
     responses:
       200:
         description: List of authors
+        headers:
+          ETag:
+            type: string
+            description: Weak validator that changes when the data may have changed
         schema:
           type: object
           properties:
@@ -648,11 +1027,15 @@ def get_authors():
                     type: string
             count:
               type: integer
+      304:
+        description: Not modified (empty body)
+        headers:
+          ETag:
+            type: string
     """
-    return jsonify({
-        "authors": list(authors.values()),
-        "count": len(authors)
-    }), 200
+    version = authors_version
+    etag = f'{etag_prefix}-a{version}'
+    return not_modified(etag) or json_bytes_response(list_authors_body(version), 200, etag)
 
 
 @app.route('/api/v1/authors/<author_id>', methods=['GET'])
@@ -669,9 +1052,18 @@ def get_author(author_id):
         type: string
         required: true
         description: The ID of the author to retrieve
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag from a previous response; returns 304 with no body if it still matches
     responses:
       200:
         description: Author details
+        headers:
+          ETag:
+            type: string
+            description: Weak validator that changes when the data may have changed
         schema:
           type: object
           properties:
@@ -685,6 +1077,11 @@ def get_author(author_id):
               type: string
             created_at:
               type: string
+      304:
+        description: Not modified (empty body)
+        headers:
+          ETag:
+            type: string
       404:
         description: Author not found
         schema:
@@ -693,10 +1090,11 @@ def get_author(author_id):
             error:
               type: string
     """
+    etag = f'{etag_prefix}-a{authors_version}-{author_id}'
     author = authors.get(author_id)
     if not author:
-        return jsonify({"error": "Author not found"}), 404
-    return jsonify(author), 200
+        return json_response({"error": "Author not found"}, 404)
+    return not_modified(etag) or json_response(author, 200, etag)
 
 
 @app.route('/api/v1/authors', methods=['POST'])
@@ -746,37 +1144,45 @@ def create_author():
             updated_at:
               type: string
       400:
-        description: Invalid input
+        description: Invalid input (malformed JSON, missing required field or wrong field type)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      413:
+        description: Request body larger than 64 KiB
         schema:
           type: object
           properties:
             error:
               type: string
     """
-    data = request.get_json()
-    
-    # Validation
-    required_fields = ['name', 'birth_year', 'nationality']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
+    global authors_version
+    # Parse and validate
+    try:
+        data = msgspec.json.decode(request.get_data(cache=False), type=AuthorInput)
+    except msgspec.DecodeError as e:
+        return json_response({"error": str(e)}, 400)
     
     # Generate new ID
-    author_id = str(uuid.uuid4())
+    author_id = os.urandom(16).hex()
     
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    timestamp = now_iso()
     
-    new_author = {
-        "id": author_id,
-        "name": data['name'],
-        "birth_year": data['birth_year'],
-        "nationality": data['nationality'],
-        "created_at": timestamp,
-        "updated_at": timestamp
-    }
+    new_author = Author(
+        id=author_id,
+        name=data.name,
+        birth_year=data.birth_year,
+        nationality=sys.intern(data.nationality),
+        created_at=timestamp,
+        updated_at=timestamp
+    )
     
-    authors[author_id] = new_author
-    return jsonify(new_author), 201
+    with store_lock:
+        authors[author_id] = new_author
+        authors_version += 1
+    return json_response(new_author, 201)
 
 
 @app.route('/api/v1/authors/<author_id>', methods=['PUT'])
@@ -835,38 +1241,48 @@ def update_author(author_id):
             error:
               type: string
       400:
-        description: Invalid input
+        description: Invalid input (malformed JSON, missing required field or wrong field type)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      413:
+        description: Request body larger than 64 KiB
         schema:
           type: object
           properties:
             error:
               type: string
     """
+    global authors_version
     if author_id not in authors:
-        return jsonify({"error": "Author not found"}), 404
+        return json_response({"error": "Author not found"}, 404)
     
-    data = request.get_json()
+    # Parse and validate
+    try:
+        data = msgspec.json.decode(request.get_data(cache=False), type=AuthorInput)
+    except msgspec.DecodeError as e:
+        return json_response({"error": str(e)}, 400)
     
-    # Validation
-    required_fields = ['name', 'birth_year', 'nationality']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
-    
-    # Preserve original creation timestamp
-    created_at = authors[author_id]['created_at']
-    
-    updated_author = {
-        "id": author_id,
-        "name": data['name'],
-        "birth_year": data['birth_year'],
-        "nationality": data['nationality'],
-        "created_at": created_at,
-        "updated_at": datetime.utcnow().isoformat() + "Z"
-    }
-    
-    authors[author_id] = updated_author
-    return jsonify(updated_author), 200
+    with store_lock:
+        author = authors.get(author_id)
+        if author is None:
+            return json_response({"error": "Author not found"}, 404)
+        
+        updated_author = Author(
+            id=author_id,
+            name=data.name,
+            birth_year=data.birth_year,
+            nationality=sys.intern(data.nationality),
+            # Preserve original creation timestamp
+            created_at=author.created_at,
+            updated_at=now_iso()
+        )
+        
+        authors[author_id] = updated_author
+        authors_version += 1
+    return json_response(updated_author, 200)
 
 
 @app.route('/api/v1/authors/<author_id>', methods=['DELETE'])
@@ -894,10 +1310,11 @@ def delete_author(author_id):
             error:
               type: string
     """
-    if author_id not in authors:
-        return jsonify({"error": "Author not found"}), 404
-    
-    del authors[author_id]
+    global authors_version
+    with store_lock:
+        if authors.pop(author_id, None) is None:
+            return json_response({"error": "Author not found"}, 404)
+        authors_version += 1
     return '', 204
 
 
@@ -915,9 +1332,18 @@ def get_author_books(author_id):
         type: string
         required: true
         description: The ID of the author
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag from a previous response; returns 304 with no body if it still matches
     responses:
       200:
         description: List of books by the author
+        headers:
+          ETag:
+            type: string
+            description: Weak validator that changes when the data may have changed
         schema:
           type: object
           properties:
@@ -934,6 +1360,11 @@ def get_author_books(author_id):
                 type: object
             count:
               type: integer
+      304:
+        description: Not modified (empty body)
+        headers:
+          ETag:
+            type: string
       404:
         description: Author not found
         schema:
@@ -942,20 +1373,35 @@ def get_author_books(author_id):
             error:
               type: string
     """
+    etag = f'{etag_prefix}-a{authors_version}-b{books_version}-{author_id}'
     author = authors.get(author_id)
     if not author:
-        return jsonify({"error": "Author not found"}), 404
+        return json_response({"error": "Author not found"}, 404)
+    
+    cached = not_modified(etag)
+    if cached:
+        return cached
     
-    author_books = [book for book in books.values() if book['author_id'] == author_id]
+    with store_lock:
+        author_books = [books[bid] for bid in books_by_author.get(author_id, ())]
     
-    return jsonify({
+    return json_response({
         "author": author,
         "books": author_books,
         "count": len(author_books)
-    }), 200
+    }, 200, etag)
 
 
 # Root endpoint
+
+# The docs link is only advertised when Swagger UI is actually served
+ROOT_BODY = orjson.dumps({
+    "message": "Welcome to the BookStore API",
+    "version": "1.0.0",
+    **({"docs": "/api/docs"} if swagger_enabled else {})
+})
+
+
 @app.route('/', methods=['GET'])
 def root():
     """
@@ -974,15 +1420,13 @@ def root():
               type: string
             docs:
               type: string
+              description: Swagger UI path (omitted when ENABLE_SWAGGER=0)
     """
-    return jsonify({
-        "message": "Welcome to the BookStore API",
-        "version": "1.0.0",
-        "docs": "/api/docs"
-    }), 200
+    return json_bytes_response(ROOT_BODY, 200)
 
 
 if __name__ == '__main__':
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
     # Only enable debug mode if explicitly set in environment variable
     # Never use debug=True in production as it exposes the debugger
     debug_mode = os.environ.get('FLASK_DEBUG', 'False').lower() in ('true', '1', 't')
@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration for running the BookStore API in production
+
+Usage: gunicorn app:app
+"""
+
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Serve docs from a static copy of openapi.yaml in production; set
+# ENABLE_SWAGGER=1 to keep Flasgger's Swagger UI and /apispec.json
+os.environ.setdefault('ENABLE_SWAGGER', '0')
+
+# The data store lives in process memory, so every worker process holds its
+# own copy of `books` and `authors` and writes are not shared between them.
+# Default to a single worker and scale with threads; raise WEB_CONCURRENCY
+# (e.g. to 2 * CPU cores + 1) only for read-only or disposable deployments.
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Keep idle client connections open so clients can reuse them across requests
+keepalive = 5
+
+# Import the app once in the master so forked workers share the loaded
+# module and sample data via copy-on-write
+preload_app = True
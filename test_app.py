@@ -0,0 +1,194 @@
+"""
+Tests for the BookStore API invariants: secondary indexes, write counters
+and pagination. Run with: python -m pytest
+"""
+
+import threading
+
+import pytest
+
+import app as bookstore
+
+
+@pytest.fixture
+def client():
+    return bookstore.app.test_client()
+
+
+def make_book(client, **overrides):
+    body = {
+        "title": "Test Book",
+        "author_id": "1",
+        "isbn": "978-0-00-000000-0",
+        "published_year": 2000,
+        "price": 10.0,
+        "stock": 1,
+    }
+    body.update(overrides)
+    response = client.post('/api/v1/books', json=body)
+    assert response.status_code == 201
+    return response.json
+
+
+def make_author(client):
+    response = client.post('/api/v1/authors', json={
+        "name": "Test Author", "birth_year": 1900, "nationality": "Test",
+    })
+    assert response.status_code == 201
+    return response.json
+
+
+def assert_indexes_match_store():
+    """books_by_author and books_by_price hold exactly the books in the store"""
+    by_author = {
+        (author_id, book_id)
+        for author_id, book_ids in bookstore.books_by_author.items()
+        for book_id in book_ids
+    }
+    assert by_author == {(book.author_id, book.id) for book in bookstore.books.values()}
+    assert all(bookstore.books_by_author.values())
+    assert list(bookstore.books_by_price) == sorted(
+        (book.price, book.id) for book in bookstore.books.values()
+    )
+
+
+def test_indexes_stay_in_sync_under_concurrent_writes():
+    errors = []
+
+    def writer(worker):
+        client = bookstore.app.test_client()
+        for i in range(100):
+            book = make_book(client, author_id=str(i % 3), price=float(i % 5))
+            response = client.patch(f"/api/v1/books/{book['id']}",
+                                    json={"price": float(i % 7), "author_id": str((i + worker) % 4)})
+            if response.status_code != 200:
+                errors.append(response.status_code)
+            if i % 2:
+                response = client.put(f"/api/v1/books/{book['id']}", json={
+                    "title": "Replaced", "author_id": "2", "isbn": "x",
+                    "published_year": 1999, "price": float(i % 3),
+                })
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+            if i % 3 == 0:
+                if client.delete(f"/api/v1/books/{book['id']}").status_code != 204:
+                    errors.append('delete')
+
+    def reader():
+        client = bookstore.app.test_client()
+        for _ in range(100):
+            for url in ('/api/v1/books?author_id=1', '/api/v1/books?min_price=1&max_price=4',
+                        '/api/v1/authors/2/books', '/api/v1/books'):
+                response = client.get(url)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert_indexes_match_store()
+
+
+def test_unrelated_update_keeps_author_listing_order(client):
+    author_id = make_author(client)['id']
+    ids = [make_book(client, author_id=author_id, title=f"order-{i}")['id'] for i in range(3)]
+
+    def listed():
+        by_filter = [b['id'] for b in client.get(f'/api/v1/books?author_id={author_id}').json['books']]
+        by_author = [b['id'] for b in client.get(f'/api/v1/authors/{author_id}/books').json['books']]
+        assert by_filter == by_author
+        return by_filter
+
+    assert listed() == ids
+    assert client.patch(f'/api/v1/books/{ids[0]}', json={"stock": 3}).status_code == 200
+    assert client.put(f'/api/v1/books/{ids[1]}', json={
+        "title": "order-1", "author_id": author_id, "isbn": "y",
+        "published_year": 2001, "price": 10.0,
+    }).status_code == 200
+    assert listed() == ids
+    assert_indexes_match_store()
+
+
+def test_price_only_pagination_walks_range_in_order(client):
+    # Prices well above the sample data so only these books are in range;
+    # several share a price to exercise the tie ordering
+    prices = [501.0, 502.5, 502.5, 502.5, 503.0, 504.0, 504.0]
+    created = {make_book(client, price=price)['id'] for price in prices}
+
+    pages = []
+    offset = 0
+    while True:
+        page = client.get(f'/api/v1/books?min_price=501&max_price=504&limit=3&offset={offset}').json
+        assert page['offset'] == offset and page['limit'] == 3
+        assert page['count'] == len(page['books'])
+        if not page['books']:
+            break
+        pages.append(page['books'])
+        offset += 3
+
+    walked = [book for page in pages for book in page]
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert {book['id'] for book in walked} == created
+    assert [(b['price'], b['id']) for b in walked] == sorted((b['price'], b['id']) for b in walked)
+
+    # Boundaries are inclusive, including ties at max_price
+    tied = client.get('/api/v1/books?min_price=502.5&max_price=502.5').json
+    assert tied['count'] == 3
+
+
+@pytest.mark.parametrize("kind", ["book", "author"])
+def test_conditional_gets_return_304_until_a_write(client, kind):
+    author = make_author(client)
+    book = make_book(client, author_id=author['id'])
+    urls = [
+        '/api/v1/books',
+        f"/api/v1/books?author_id={author['id']}",
+        '/api/v1/books?min_price=1&max_price=20',
+        f"/api/v1/books/{book['id']}",
+        '/api/v1/authors',
+        f"/api/v1/authors/{author['id']}",
+        f"/api/v1/authors/{author['id']}/books",
+    ]
+
+    etags = {}
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200
+        etags[url] = response.headers['ETag']
+        assert etags[url].startswith('W/')
+
+        cached = client.get(url, headers={'If-None-Match': etags[url]})
+        assert cached.status_code == 304
+        assert cached.data == b''
+        assert cached.headers['ETag'] == etags[url]
+
+    # A book write invalidates book-derived ETags, an author write author-derived ones
+    if kind == "book":
+        assert client.patch(f"/api/v1/books/{book['id']}", json={"stock": 7}).status_code == 200
+        changed = [url for url in urls if 'books' in url]
+    else:
+        assert client.put(f"/api/v1/authors/{author['id']}", json={
+            "name": "Renamed", "birth_year": 1901, "nationality": "Test",
+        }).status_code == 200
+        changed = [url for url in urls if 'authors' in url]
+
+    for url in urls:
+        response = client.get(url, headers={'If-None-Match': etags[url]})
+        if url in changed:
+            assert response.status_code == 200, url
+            assert response.headers['ETag'] != etags[url]
+            assert response.data
+        else:
+            assert response.status_code == 304, url
+
+
+def test_missing_resources_do_not_send_etags(client):
+    for url in ('/api/v1/books/missing', '/api/v1/authors/missing', '/api/v1/authors/missing/books'):
+        response = client.get(url)
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers